@@ -9,43 +9,117 @@ This script automates the process of creating releases for the MathFonts reposit
 4. Handles version tagging and change log generation
 
 Usage:
-    python release.py [--version VERSION] [--dry-run] [--token TOKEN]
+    python release.py [--version VERSION] [--dry-run] [--token TOKEN] [--algo {zst,gz}] [--force-rebuild] [--clean]
     
 Arguments:
     --version VERSION   Specify version (default: auto-increment patch)
     --dry-run          Show what would be done without executing
     --token TOKEN      GitHub personal access token (or set GITHUB_TOKEN env var)
+    --algo {zst,gz}    Tarball compression (default: zst)
+    --force-rebuild    Rebuild fonts even if the build inputs are unchanged
+    --clean            Run 'make clean' first, also discarding sources kept in tmp/
 """
 
 import argparse
+import gzip
+import hashlib
+import io
 import json
+import mmap
 import os
+import queue
+import re
+import shutil
 import subprocess
 import sys
 import tarfile
 import tempfile
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import libarchive
+except ImportError:  # optional: libarchive-c writes tarballs in C when installed
+    libarchive = None
+
+# External compressors the tar stream is piped through, keyed by archive suffix
+TAR_COMPRESSORS = {
+    'zst': ['zstd', '-q', '-T0', '-19', '--long'],
+    'gz': ['pigz', '-n', '-p', str(os.cpu_count() or 1)],
+}
+
+# libarchive filter and write options used for each tarball suffix, matching the CLI flags
+LIBARCHIVE_FILTERS = {
+    'zst': ('zstd', f'zstd:compression-level=19,zstd:threads={os.cpu_count() or 1}'),
+    'gz': ('gzip', 'gzip:compression-level=1'),
+}
+
+# zstd --long (128 MiB window), only understood by libarchive 3.7 and newer
+LIBARCHIVE_ZSTD_LONG = 'zstd:long=27'
+
+# Release tags look like v1.2.3 (the 'v' is optional)
+VERSION_RE = re.compile(r'v?(\d+)\.(\d+)\.(\d+)')
+
+# Editor/OS/Python leftovers never shipped in release archives
+EXCLUDED_NAMES = {'.DS_Store', 'Thumbs.db', '__pycache__'}
+EXCLUDED_SUFFIXES = ('.pyc', '.pyo')
+
+# Free space /dev/shm needs before archives are staged there; container defaults
+# (often 64 MiB) are too small for the font archives
+SHM_MIN_FREE = 1 << 30
+
+# Files whose changes require the fonts to be rebuilt
+BUILD_INPUTS = ('Makefile', 'utils.sh', 'compress_font.py')
+
+# Maximum number of release assets uploaded at once
+UPLOAD_WORKERS = 4
+
+# Already-compressed web font formats are stored as-is in the zip
+STORED_SUFFIXES = ('.woff2', '.woff')
 
 
 class MathFontsReleaser:
-    def __init__(self, dry_run: bool = False, github_token: Optional[str] = None):
+    def __init__(self, dry_run: bool = False, github_token: Optional[str] = None,
+                 algo: str = 'zst', force_rebuild: bool = False, clean: bool = False):
         self.dry_run = dry_run
+        self.algo = algo
+        self.force_rebuild = force_rebuild
+        self.clean = clean
         self.github_token = github_token or os.getenv('GITHUB_TOKEN')
         self.repo_owner = 'pde-rent'
         self.repo_name = 'MathFonts'
         self.base_dir = Path(__file__).parent
         self.dist_dir = self.base_dir / 'dist'
+        self._summary_cache: Optional[Dict[str, any]] = None
+        self._current_version: Optional[str] = None
+        self.archive_dir: Optional[Path] = None
+        self.tar_compressor: Optional[str] = None
+        
+        # Keep-alive connections shared by all GitHub API calls and the concurrent asset
+        # uploads; only failed connects are retried since they happen before any body is sent
+        self.session = requests.Session()
+        if self.github_token:
+            self.session.headers['Authorization'] = f'token {self.github_token}'
+        self.session.mount('https://', HTTPAdapter(pool_connections=UPLOAD_WORKERS,
+                                                   pool_maxsize=UPLOAD_WORKERS,
+                                                   max_retries=Retry(connect=3, read=0,
+                                                                     backoff_factor=1)))
         
     def log(self, message: str, level: str = 'INFO'):
         """Log a message with timestamp and level."""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         prefix = '[DRY-RUN] ' if self.dry_run else ''
-        print(f"{prefix}[{timestamp}] {level}: {message}")
+        # One write per line so messages from upload threads do not interleave
+        sys.stdout.write(f"{prefix}[{timestamp}] {level}: {message}\n")
+        sys.stdout.flush()
         
     def run_command(self, cmd: List[str], capture_output: bool = True) -> subprocess.CompletedProcess:
         """Run a command, optionally in dry-run mode."""
@@ -63,23 +137,26 @@ class MathFontsReleaser:
         return result
         
     def get_current_version(self) -> str:
-        """Get the current version from git tags."""
-        try:
-            result = self.run_command(['git', 'describe', '--tags', '--abbrev=0'])
-            return result.stdout.strip()
-        except subprocess.CalledProcessError:
-            return 'v0.0.0'  # Default if no tags exist
+        """Get the current version from git tags (queried once per release)."""
+        if self._current_version is not None:
+            return self._current_version
+            
+        # Read-only query, so it also runs in dry-run mode; run_command would exit on failure
+        result = subprocess.run(['git', 'describe', '--tags', '--abbrev=0'],
+                                capture_output=True, text=True, cwd=self.base_dir)
+        if result.returncode != 0:
+            self._current_version = 'v0.0.0'  # Default if no tags exist
+        else:
+            self._current_version = result.stdout.strip()
+        return self._current_version
             
     def increment_version(self, version: str, increment_type: str = 'patch') -> str:
         """Increment version number."""
-        # Remove 'v' prefix if present
-        version = version.lstrip('v')
-        
-        parts = version.split('.')
-        if len(parts) != 3:
+        match = VERSION_RE.fullmatch(version)
+        if not match:
             return 'v1.0.0'
             
-        major, minor, patch = map(int, parts)
+        major, minor, patch = map(int, match.groups())
         
         if increment_type == 'major':
             major += 1
@@ -101,54 +178,251 @@ class MathFontsReleaser:
             self.log("Makefile not found", 'ERROR')
             sys.exit(1)
             
-        # Clean and build
-        self.run_command(['make', 'clean'], capture_output=False)
-        self.run_command(['make', 'all-parallel'], capture_output=False)
+        # Font targets are phony, so make cannot tell an up-to-date dist/ on its own
+        cache_path = self.base_dir / 'tmp' / '.release-cache'
+        fingerprint = self.build_fingerprint()
+        if (not self.clean and not self.force_rebuild and self.dist_dir.exists()
+                and cache_path.exists() and cache_path.read_text() == fingerprint):
+            self.log("Build inputs unchanged since the last build, reusing dist/")
+            return
+            
+        # Invalidate first so a build that fails partway is never mistaken for a finished one
+        if not self.dry_run:
+            cache_path.unlink(missing_ok=True)
+            
+        if self.clean:
+            self.run_command(['make', 'clean'], capture_output=False)
+        else:
+            # Start from an empty dist/ so fonts dropped upstream are not shipped; tmp/
+            # keeps the sources of fonts whose last build stopped before finalizing
+            self.log("Removing previous dist/ before rebuilding")
+            if not self.dry_run:
+                shutil.rmtree(self.dist_dir, ignore_errors=True)
+            self.prune_stale_stamps()
+            
+        # Dependencies are checked up front; under -j 'all' would race them with the downloads
+        self.run_command(['make', 'check-deps'], capture_output=False)
+        # At least 4 jobs like all-parallel: font jobs are mostly network downloads
+        jobs = max(4, os.cpu_count() or 1)
+        self.run_command(['make', f'-j{jobs}', 'all'], capture_output=False)
         
         if not self.dist_dir.exists():
             self.log("dist/ directory not created after build", 'ERROR')
             sys.exit(1)
             
+        if not self.dry_run:
+            cache_path.parent.mkdir(exist_ok=True)
+            cache_path.write_text(fingerprint)
         self.log("Font build completed successfully")
         
+    def prune_stale_stamps(self):
+        """Drop download stamps whose sources were already removed from tmp/."""
+        # finalize_font deletes tmp/<Font>/ after processing but keeps the stamp, which
+        # would make the next build process that font with no sources at all
+        tmp_dir = self.base_dir / 'tmp'
+        if not tmp_dir.is_dir():
+            return
+            
+        for stamp in tmp_dir.glob('*-downloaded'):
+            font = stamp.name[:-len('-downloaded')]
+            if not (tmp_dir / font).is_dir():
+                self.log(f"Sources for {font} are gone, it will be downloaded again")
+                if not self.dry_run:
+                    stamp.unlink()
+                    
+    def build_fingerprint(self) -> str:
+        """Hash the mtime and size of every build input."""
+        h = hashlib.sha256()
+        for name in BUILD_INPUTS:
+            path = self.base_dir / name
+            if path.exists():
+                st = path.stat()
+                h.update(f"{name}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+        return h.hexdigest()
+        
     def create_archives(self, version: str) -> Dict[str, Path]:
-        """Create zip and tar.gz archives of the dist directory."""
+        """Create zip and compressed tar archives of the dist directory."""
         self.log(f"Creating archives for version {version}")
         
         archives = {}
         version_clean = version.lstrip('v')
         
-        # Create zip archive
+        # Fail before any archive work if the tarball cannot be written
+        self.tar_compressor = self.resolve_tar_compressor()
+        
+        # Both archives are filled from one pass over dist/
+        self.archive_dir = self.make_archive_dir()
         zip_name = f"mathfonts-{version_clean}.zip"
-        zip_path = self.base_dir / 'tmp' / zip_name
-        zip_path.parent.mkdir(exist_ok=True)
+        zip_path = self.archive_dir / zip_name
+        
+        tar_name = f"mathfonts-{version_clean}.tar.{self.algo}"
+        tar_path = self.archive_dir / tar_name
         
         if not self.dry_run:
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                for root, dirs, files in os.walk(self.dist_dir):
-                    for file in files:
-                        file_path = Path(root) / file
-                        arc_path = file_path.relative_to(self.dist_dir)
-                        zf.write(file_path, f"mathfonts-{version_clean}/{arc_path}")
-                        
+            self.write_archives(zip_path, tar_path, f"mathfonts-{version_clean}")
+            
         archives['zip'] = zip_path
         self.log(f"Created ZIP archive: {zip_path}")
         
-        # Create tar.gz archive
-        tar_name = f"mathfonts-{version_clean}.tar.gz"
-        tar_path = self.base_dir / 'tmp' / tar_name
+        archives[f'tar.{self.algo}'] = tar_path
+        self.log(f"Created TAR.{self.algo.upper()} archive: {tar_path}")
         
-        if not self.dry_run:
-            with tarfile.open(tar_path, 'w:gz') as tf:
-                tf.add(self.dist_dir, arcname=f"mathfonts-{version_clean}")
+        return archives
+        
+    def resolve_tar_compressor(self) -> Optional[str]:
+        """Locate the external tar compressor, exiting if the chosen format cannot be written."""
+        name = TAR_COMPRESSORS[self.algo][0]
+        compressor = shutil.which(name)
+        
+        # gz falls back to Python's gzip and zst to libarchive's zstd filter
+        if not compressor and self.algo != 'gz' and libarchive is None:
+            self.log(f"{name} not found, required for .tar.{self.algo} archives", 'ERROR')
+            sys.exit(1)
+        return compressor
+        
+    def make_archive_dir(self) -> Path:
+        """Create a scratch directory for the archives, in RAM-backed /dev/shm when it has room."""
+        root = Path(tempfile.gettempdir())
+        shm = Path('/dev/shm')
+        if (shm.is_dir() and os.access(shm, os.W_OK)
+                and shutil.disk_usage(shm).free >= SHM_MIN_FREE):
+            root = shm
+            
+        return Path(tempfile.mkdtemp(prefix='mathfonts-', dir=root))
+        
+    def iter_dist_entries(self, prefix: str) -> Iterator[Tuple[str, bytes, os.stat_result]]:
+        """Read each file under dist/ once, yielding (archive name, contents, stat)."""
+        for path, arcname, st in self._scan_tree(str(self.dist_dir), f"{prefix}/"):
+            with open(path, 'rb') as f:
+                yield arcname, f.read(), st
+                
+    def _scan_tree(self, directory: str, prefix: str) -> Iterator[Tuple[str, str, os.stat_result]]:
+        """Recursively yield (path, archive name, stat) for files, reusing scandir's entry types."""
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name in EXCLUDED_NAMES or entry.name.endswith(EXCLUDED_SUFFIXES):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._scan_tree(entry.path, f"{prefix}{entry.name}/")
+                else:
+                    yield entry.path, f"{prefix}{entry.name}", entry.stat()
+                
+    def write_archives(self, zip_path: Path, tar_path: Path, prefix: str):
+        """Write the zip and tar archives concurrently from a single walk of dist/."""
+        # Bounded queues keep the reader at most a few files ahead of the slower writer
+        queues = [queue.Queue(maxsize=16), queue.Queue(maxsize=16)]
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                pool.submit(self._consume, self.write_zip, zip_path, queues[0]),
+                pool.submit(self._consume, self.write_tar, tar_path, queues[1]),
+            ]
+            try:
+                for entry in self.iter_dist_entries(prefix):
+                    for q in queues:
+                        q.put(entry)
+            finally:
+                for q in queues:
+                    q.put(None)
+                    
+            for future in futures:
+                future.result()
+                
+    def _consume(self, writer, path: Path, q: queue.Queue):
+        """Feed queued entries to an archive writer until the None sentinel."""
+        entries = iter(q.get, None)
+        try:
+            writer(path, entries)
+        finally:
+            # Keep draining so the reader never blocks on a failed writer
+            for _ in entries:
+                pass
+                
+    def write_zip(self, zip_path: Path, entries: Iterable[Tuple[str, bytes, os.stat_result]]):
+        """Write entries into a zip archive."""
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for arcname, data, st in entries:
+                zinfo = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[:6])
+                zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+                if arcname.endswith(STORED_SUFFIXES):
+                    zf.writestr(zinfo, data, zipfile.ZIP_STORED)
+                else:
+                    zf.writestr(zinfo, data, zipfile.ZIP_DEFLATED, 1)
                 
-        archives['tar.gz'] = tar_path
-        self.log(f"Created TAR.GZ archive: {tar_path}")
+    def write_tar(self, tar_path: Path, entries: Iterable[Tuple[str, bytes, os.stat_result]]):
+        """Write entries into a tarball through a multi-threaded compressor."""
+        cmd = TAR_COMPRESSORS[self.algo]
+        compressor = self.tar_compressor
+        
+        # libarchive's zstd filter is threaded itself; its gzip filter is not, so pigz wins
+        if libarchive is not None and (self.algo == 'zst' or not compressor):
+            self._write_tar_libarchive(tar_path, entries)
+            return
+            
+        if not compressor:
+            # Forward-only stream mode, with fast deflate since fonts barely compress
+            with open(tar_path, 'wb') as raw, \
+                    gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=1) as gz, \
+                    tarfile.open(fileobj=gz, mode='w|') as tf:
+                self._add_tar_entries(tf, entries)
+            return
+            
+        # Python only builds the tar stream; the compressor runs across all cores
+        with open(tar_path, 'wb') as out:
+            proc = subprocess.Popen([compressor] + cmd[1:], stdin=subprocess.PIPE, stdout=out)
+            with tarfile.open(fileobj=proc.stdin, mode='w|') as tf:
+                self._add_tar_entries(tf, entries)
+            proc.stdin.close()
+            
+            if proc.wait() != 0:
+                self.log(f"{cmd[0]} failed with exit code {proc.returncode}", 'ERROR')
+                sys.exit(1)
+                
+    def _write_tar_libarchive(self, tar_path: Path, entries: Iterable[Tuple[str, bytes, os.stat_result]]):
+        """Write entries into a tarball with libarchive, headers and compression included."""
+        filter_name, options = LIBARCHIVE_FILTERS[self.algo]
+        if self.algo == 'zst' and libarchive.ffi.version_number() >= 3007000:
+            options = f"{options},{LIBARCHIVE_ZSTD_LONG}"
+        with libarchive.file_writer(str(tar_path), 'gnutar', filter_name, options=options) as archive:
+            for arcname, data, st in entries:
+                archive.add_file_from_memory(arcname, len(data), data,
+                                             permission=st.st_mode & 0o7777,
+                                             mtime=int(st.st_mtime))
+                
+    def _add_tar_entries(self, tf: tarfile.TarFile, entries: Iterable[Tuple[str, bytes, os.stat_result]]):
+        """Append in-memory file entries to an open tarball."""
+        for arcname, data, st in entries:
+            info = tarfile.TarInfo(arcname)
+            info.size = len(data)
+            info.mtime = st.st_mtime
+            info.mode = st.st_mode & 0o7777
+            tf.addfile(info, io.BytesIO(data))
+        
+    def write_checksums(self, archives: Dict[str, Path]) -> Path:
+        """Write a SHA256SUMS manifest (sha256sum format) for the archives."""
+        sums_path = self.archive_dir / 'SHA256SUMS'
         
-        return archives
+        if not self.dry_run:
+            # hashlib releases the GIL, so archives are hashed in parallel
+            with ThreadPoolExecutor() as pool:
+                digests = list(pool.map(self._sha256, archives.values()))
+            sums_path.write_text(''.join(f"{digest}  {path.name}\n"
+                                         for digest, path in zip(digests, archives.values())))
+            
+        self.log(f"Created checksum manifest: {sums_path}")
+        return sums_path
+        
+    @staticmethod
+    def _sha256(path: Path) -> str:
+        """Hash a file through a read-only memory map."""
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
         
     def get_font_summary(self) -> Dict[str, any]:
-        """Generate a summary of fonts in the distribution."""
+        """Generate a summary of fonts in the distribution (computed once per release)."""
+        if self._summary_cache is not None:
+            return self._summary_cache
+            
         if not self.dist_dir.exists():
             return {}
             
@@ -159,64 +433,72 @@ class MathFontsReleaser:
             'math_fonts': []
         }
         
-        for family_dir in self.dist_dir.iterdir():
-            if not family_dir.is_dir():
-                continue
-                
+        with os.scandir(self.dist_dir) as families:
+            family_dirs = [entry for entry in families if entry.is_dir()]
+            
+        for family_dir in family_dirs:
+            family_name = family_dir.name
             family_info = {
-                'name': family_dir.name,
+                'name': family_name,
                 'fonts': [],
                 'size_mb': 0
             }
             
-            for font_file in family_dir.glob('*.woff2'):
-                size_bytes = font_file.stat().st_size
-                size_mb = size_bytes / (1024 * 1024)
-                
-                family_info['fonts'].append({
-                    'name': font_file.name,
-                    'size_mb': round(size_mb, 2)
-                })
-                family_info['size_mb'] += size_mb
-                summary['total_size_mb'] += size_mb
-                summary['total_fonts'] += 1
-                
-                # Check if it's a math font
-                if 'math' in font_file.name.lower():
-                    summary['math_fonts'].append(f"{family_dir.name}/{font_file.name}")
+            with os.scandir(family_dir) as it:
+                for font_file in it:
+                    name = font_file.name
+                    if not name.endswith('.woff2'):
+                        continue
+                        
+                    size_bytes = font_file.stat().st_size
+                    size_mb = size_bytes / (1024 * 1024)
+                    
+                    family_info['fonts'].append({
+                        'name': name,
+                        'size_mb': round(size_mb, 2)
+                    })
+                    family_info['size_mb'] += size_mb
+                    summary['total_size_mb'] += size_mb
+                    summary['total_fonts'] += 1
                     
+                    # Check if it's a math font
+                    if 'math' in name.lower():
+                        summary['math_fonts'].append(f"{family_name}/{name}")
+                        
             family_info['size_mb'] = round(family_info['size_mb'], 2)
             summary['font_families'].append(family_info)
             
         summary['total_size_mb'] = round(summary['total_size_mb'], 2)
+        self._summary_cache = summary
         return summary
         
-    def generate_release_notes(self, version: str, previous_version: str) -> str:
-        """Generate release notes."""
-        font_summary = self.get_font_summary()
-        
-        notes = f"""# MathFonts Release {version}
+    def generate_release_notes(self, version: str, previous_version: str,
+                               font_summary: Optional[Dict[str, any]] = None) -> str:
+        """Generate release notes from a font summary (computed if not given)."""
+        if font_summary is None:
+            font_summary = self.get_font_summary()
+            
+        parts = [f"""# MathFonts Release {version}
 
 ## Overview
 This release contains {font_summary.get('total_fonts', 0)} optimized WOFF2 math fonts from {len(font_summary.get('font_families', []))} font families, totaling {font_summary.get('total_size_mb', 0):.1f} MB.
 
 ## Font Families Included
-"""
+"""]
         
-        for family in font_summary.get('font_families', []):
-            notes += f"- **{family['name']}**: {len(family['fonts'])} fonts ({family['size_mb']:.1f} MB)\n"
-            
-        notes += f"""
+        parts.extend(f"- **{family['name']}**: {len(family['fonts'])} fonts ({family['size_mb']:.1f} MB)\n"
+                     for family in font_summary.get('font_families', []))
+        
+        parts.append("""
 ## Math Fonts
 The following fonts provide mathematical symbol support:
-"""
+""")
         
-        for math_font in font_summary.get('math_fonts', []):
-            notes += f"- {math_font}\n"
-            
-        notes += f"""
+        parts.extend(f"- {math_font}\n" for math_font in font_summary.get('math_fonts', []))
+        
+        parts.append(f"""
 ## Installation
-1. Download the archive (ZIP or TAR.GZ)
+1. Download the archive (ZIP or TAR.{self.algo.upper()}) and optionally verify it with `sha256sum -c SHA256SUMS`
 2. Extract to your desired location
 3. Reference fonts in your CSS or LaTeX documents
 
@@ -230,8 +512,8 @@ These fonts are optimized for web use and mathematical typesetting. See the main
 
 ---
 *Generated automatically by the MathFonts release system*
-"""
-        return notes
+""")
+        return ''.join(parts)
         
     def create_github_release(self, version: str, archives: Dict[str, Path]) -> bool:
         """Create a GitHub release with the archives."""
@@ -240,14 +522,12 @@ These fonts are optimized for web use and mathematical typesetting. See the main
             return False
             
         previous_version = self.get_current_version()
-        release_notes = self.generate_release_notes(version, previous_version)
+        font_summary = self.get_font_summary()
+        release_notes = self.generate_release_notes(version, previous_version, font_summary)
         
         # Create the release
         url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases"
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
+        headers = {'Accept': 'application/vnd.github.v3+json'}
         
         release_data = {
             'tag_name': version,
@@ -264,36 +544,66 @@ These fonts are optimized for web use and mathematical typesetting. See the main
             self.log(json.dumps(release_data, indent=2))
             return True
             
-        response = requests.post(url, headers=headers, json=release_data)
+        # Re-runs reuse the existing release and its asset list from a single lookup
+        response = self.session.get(f"{url}/tags/{version}", headers=headers)
         
-        if response.status_code != 201:
-            self.log(f"Failed to create release: {response.status_code}", 'ERROR')
-            self.log(response.text, 'ERROR')
-            return False
+        if response.status_code == 200:
+            self.log(f"Release {version} already exists, resuming asset upload")
+        else:
+            response = self.session.post(url, headers=headers, json=release_data)
             
+            if response.status_code != 201:
+                self.log(f"Failed to create release: {response.status_code}", 'ERROR')
+                self.log(response.text, 'ERROR')
+                return False
+                
         release_info = response.json()
         upload_url = release_info['upload_url'].replace('{?name,label}', '')
+        existing_assets = {asset['name']: asset for asset in release_info.get('assets', [])}
         
-        # Upload archives
-        for archive_type, archive_path in archives.items():
-            self.upload_release_asset(upload_url, archive_path)
+        # Upload archives concurrently
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            list(pool.map(lambda archive_path: self.upload_release_asset(
+                upload_url, archive_path, existing_assets.get(archive_path.name)),
+                archives.values()))
             
         self.log(f"Successfully created release: {release_info['html_url']}")
         return True
         
-    def upload_release_asset(self, upload_url: str, asset_path: Path):
-        """Upload a file to the GitHub release."""
+    def upload_release_asset(self, upload_url: str, asset_path: Path,
+                             existing_asset: Optional[Dict[str, any]] = None):
+        """Upload a file to the GitHub release, streaming it from disk."""
+        size = asset_path.stat().st_size
+        
+        if existing_asset is not None:
+            # Size is checked first; the digest, when GitHub reports one, settles the rest
+            digest = existing_asset.get('digest')
+            if existing_asset['size'] == size and (
+                    not digest or digest == f"sha256:{self._sha256(asset_path)}"):
+                self.log(f"Skipping {asset_path.name}, already uploaded")
+                return
+                
+            # Asset names are unique per release, so a stale copy must go first
+            self.log(f"Replacing outdated {asset_path.name}")
+            response = self.session.delete(existing_asset['url'])
+            
+            if response.status_code != 204:
+                self.log(f"Failed to delete outdated {asset_path.name}: {response.status_code}", 'ERROR')
+                self.log(response.text, 'ERROR')
+                return
+            
         headers = {
-            'Authorization': f'token {self.github_token}',
-            'Content-Type': 'application/octet-stream'
+            'Content-Type': 'application/octet-stream',
+            'Content-Length': str(size)
         }
         
         params = {'name': asset_path.name}
         
         self.log(f"Uploading {asset_path.name}")
         
+        # A file object body is sent in blocks rather than read into memory
         with open(asset_path, 'rb') as f:
-            response = requests.post(upload_url, headers=headers, params=params, data=f)
+            response = self.session.post(upload_url, headers=headers, params=params, data=f)
             
         if response.status_code != 201:
             self.log(f"Failed to upload {asset_path.name}: {response.status_code}", 'ERROR')
@@ -314,8 +624,14 @@ These fonts are optimized for web use and mathematical typesetting. See the main
                 archive_path.unlink()
                 self.log(f"Cleaned up {archive_path}")
                 
+        # Also removes partial archives left behind by a failed create_archives
+        if self.archive_dir is not None:
+            shutil.rmtree(self.archive_dir, ignore_errors=True)
+            self.archive_dir = None
+                
     def release(self, version: Optional[str] = None) -> bool:
         """Execute the complete release process."""
+        archives: Dict[str, Path] = {}
         try:
             # Determine version
             if not version:
@@ -324,11 +640,15 @@ These fonts are optimized for web use and mathematical typesetting. See the main
                 
             self.log(f"Creating release {version}")
             
+            # Check the tarball can be written before spending time on the build
+            self.resolve_tar_compressor()
+            
             # Build fonts
             self.build_fonts()
             
-            # Create archives
+            # Create archives and their checksum manifest
             archives = self.create_archives(version)
+            archives['sha256'] = self.write_checksums(archives)
             
             # Create GitHub release
             success = self.create_github_release(version, archives)
@@ -347,8 +667,7 @@ These fonts are optimized for web use and mathematical typesetting. See the main
             return False
         finally:
             # Cleanup
-            if 'archives' in locals():
-                self.cleanup_archives(archives)
+            self.cleanup_archives(archives)
                 
         return True
 
@@ -358,10 +677,17 @@ def main():
     parser.add_argument('--version', help='Release version (e.g., v1.2.3)')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be done')
     parser.add_argument('--token', help='GitHub personal access token')
+    parser.add_argument('--algo', choices=sorted(TAR_COMPRESSORS), default='zst',
+                        help='Tarball compression (default: zst)')
+    parser.add_argument('--force-rebuild', action='store_true',
+                        help='Rebuild fonts even if the build inputs are unchanged')
+    parser.add_argument('--clean', action='store_true',
+                        help="Run 'make clean' before building")
     
     args = parser.parse_args()
     
-    releaser = MathFontsReleaser(dry_run=args.dry_run, github_token=args.token)
+    releaser = MathFontsReleaser(dry_run=args.dry_run, github_token=args.token, algo=args.algo,
+                                 force_rebuild=args.force_rebuild, clean=args.clean)
     
     success = releaser.release(args.version)
     sys.exit(0 if success else 1)